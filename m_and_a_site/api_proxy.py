@@ -1,8 +1,10 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
 from flask_cors import CORS  # Need to install: pip install flask-cors
 import requests
+import os
 import time
 from urllib.parse import urlparse
+from upstream_client import upstream
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
@@ -19,8 +21,7 @@ PRICE_LEVELS = {
 }
 
 def search_restaurants(query, location="", max_results=60):
-    """Enhanced search with pagination support for up to 60 results"""
-    url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
+    """Enhanced search with pagination support for up to 60 results, returned as raw Places results"""
     
     all_results = []
     next_page_token = None
@@ -73,10 +74,9 @@ def search_restaurants(query, location="", max_results=60):
         if 'locationbias' in params:
             print(f"🧭 LocationBias param: {params['locationbias']}")
         print(f"🔑 API Key: {GOOGLE_API_KEY[:10]}...{GOOGLE_API_KEY[-5:]}")
-        print(f"📡 Full URL: {url}")
         print(f"📋 All params: {params}")
         
-        response = requests.get(url, params=params)
+        response = upstream.get('textsearch', params)
         
         print(f"📊 HTTP Status Code: {response.status_code}")
         print(f"🌐 Actual request URL: {response.request.url[:200]}...")
@@ -146,79 +146,58 @@ def search_restaurants(query, location="", max_results=60):
     
     print(f"✅ SEARCH COMPLETE: {len(all_results)} results from {pages_fetched} pages")
     
-    # Limit to max_results and format results
+    # Limit to max_results; results stay as Google returned them until the endpoint serializes them
     final_results = all_results[:max_results]
-    formatted_results = []
     
     print(f"🗺️ COORDINATE EXTRACTION: Processing {len(final_results)} results for map markers")
     
+    coords_found = 0
     for place in final_results:
-        # Extract coordinates from geometry data
-        geometry = place.get('geometry', {})
-        location = geometry.get('location', {})
-        lat = location.get('lat')
-        lng = location.get('lng')
-        
-        # Debug logging for coordinate extraction and data validation
+        location = place.get('geometry', {}).get('location', {})
         place_name = place.get('name', 'Unknown')
-        rating = place.get('rating')
-        user_ratings_total = place.get('user_ratings_total')
         
-        if lat and lng:
-            print(f"📍 Extracted coordinates for {place_name}: {lat}, {lng}")
+        # Debug logging for coordinate extraction and data validation
+        if location.get('lat') and location.get('lng'):
+            coords_found += 1
+            print(f"📍 Extracted coordinates for {place_name}: {location['lat']}, {location['lng']}")
         else:
             print(f"❌ No coordinates found for {place_name}")
-            print(f"   Geometry data: {geometry}")
+            print(f"   Geometry data: {place.get('geometry', {})}")
             
         # Debug rating vs review count data
-        print(f"🔍 {place_name}: rating={rating}, user_ratings_total={user_ratings_total}")
-        
-        formatted_results.append({
-            'name': place.get('name'),
-            'place_id': place.get('place_id'),
-            'rating': place.get('rating'),
-            'user_ratings_total': place.get('user_ratings_total'),  # Extract review count from API
-            'address': place.get('formatted_address'),
-            'price_level': place.get('price_level'),
-            'photo_reference': place.get('photos', [{}])[0].get('photo_reference') if place.get('photos') else None,
-            'lat': lat,  # ADD coordinates for map markers
-            'lng': lng,  # ADD coordinates for map markers
-            'coordinates': {'lat': lat, 'lng': lng} if lat and lng else None  # ADD coordinate object
-        })
+        print(f"🔍 {place_name}: rating={place.get('rating')}, user_ratings_total={place.get('user_ratings_total')}")
     
     # Validate coordinate extraction for mapping
-    coords_found = sum(1 for result in formatted_results if result.get('lat') and result.get('lng'))
-    print(f"🗺️ COORDINATE SUMMARY: {coords_found}/{len(formatted_results)} restaurants have coordinates for mapping")
+    print(f"🗺️ COORDINATE SUMMARY: {coords_found}/{len(final_results)} restaurants have coordinates for mapping")
     
     if coords_found == 0:
         print("⚠️ WARNING: No restaurants have coordinates - map will not show markers")
-    elif coords_found < len(formatted_results):
-        print(f"⚠️ WARNING: {len(formatted_results) - coords_found} restaurants missing coordinates")
+    elif coords_found < len(final_results):
+        print(f"⚠️ WARNING: {len(final_results) - coords_found} restaurants missing coordinates")
     else:
         print("✅ All restaurants have coordinates - map should display all markers")
     
     return {
-        'results': formatted_results,
-        'total_found': len(formatted_results),
+        'results': final_results,
+        'total_found': len(final_results),
         'pages_fetched': pages_fetched
     }
 
 
 def get_restaurant_details(place_id):
     """Get detailed restaurant info including website"""
-    url = "https://maps.googleapis.com/maps/api/place/details/json"
     params = {
         'place_id': place_id,
         'key': GOOGLE_API_KEY,
-        'fields': 'name,website,formatted_phone_number,formatted_address,rating,price_level,opening_hours,reviews,photos,types,user_ratings_total'
+        'fields': 'name,website,formatted_phone_number,formatted_address,geometry,rating,price_level,opening_hours,reviews,photos,types,user_ratings_total'
     }
     
-    response = requests.get(url, params=params)
+    response = upstream.get('details', params)
     data = response.json()
     
     if 'result' in data:
         result = data['result']
-        return {
+        details = {
             'name': result.get('name'),
             'website': clean_website_url(result.get('website')),
             'phone': result.get('formatted_phone_number'),
@@ -241,6 +220,24 @@ def get_restaurant_details(place_id):
             'business_status': 'OPERATIONAL',
             'photo_reference': result.get('photos', [{}])[0].get('photo_reference') if result.get('photos') else None
         }
+        
+        # Keep full-length review text for review_signals.py
+        full_reviews = [
+            {
+                'author': review.get('author_name'),
+                'rating': review.get('rating'),
+                'text': review.get('text', ''),
+                'time': review.get('time')
+            }
+            for review in result.get('reviews', [])
+        ]
+        place_store.save_details(place_id, details, full_reviews)
+        
+        # A refresh rewrites the stored place too, so clusters and density see the new rating and review total
+        result['place_id'] = place_id
+        place_store.upsert_places([result])
+        
+        return details
     
     return None
 
@@ -323,10 +320,46 @@ def estimate_revenue_tier(restaurant_data):
 
 # In your Flask app file
 from webscraper import WebScraper
+from photo_cache import PhotoCache, PHOTO_SIZES, SOURCE_MAX_WIDTH, sniff_mimetype
+from place_store import PlaceStore, DEFAULT_DB_PATH
+from marker_clusters import ClusterIndex
+from market_density import MarketDensity, clamp_precision
+from enrichment_pipeline import EnrichmentPipeline, WorkQueue, DEFAULT_QUEUE_PATH
 
 # Initialize scraper
 scraper = WebScraper()
 
+# Resized place photos, kept on disk so each photo_reference is billed once
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+photo_cache = PhotoCache(os.path.join(CACHE_DIR, 'photos'))
+
+# Every place seen by searches and details lookups
+place_store = PlaceStore(DEFAULT_DB_PATH)
+
+# Map clusters per zoom level, seeded from the store then kept current on every write
+cluster_index = ClusterIndex()
+cluster_index.update_places(place_store.get_all_places())
+place_store.listeners.append(cluster_index.update_places)
+
+# Market density cells, seeded from the store then kept current on every write
+market_density = MarketDensity()
+market_density.update_places(place_store.get_all_places())
+place_store.listeners.append(market_density.update_places)
+
+# Background details -> website -> keyword scan enrichment for every searched place
+enrichment = EnrichmentPipeline(
+    WorkQueue(DEFAULT_QUEUE_PATH),
+    place_store,
+    fetch_details=get_restaurant_details,
+    clean_url=clean_website_url,
+    scraper=scraper
+)
+
+@app.before_request
+def start_enrichment():
+    # Started from the first request so it runs in the serving process only, with or without the reloader
+    enrichment.start()
+
 @app.route('/search_restaurants', methods=['POST'])
 def search_restaurants_endpoint():
     """Enhanced restaurant search endpoint with pagination support"""
@@ -345,23 +378,52 @@ def search_restaurants_endpoint():
         
         print(f"🔍 ENDPOINT DEBUG: Got {len(basic_results)} results from search_restaurants")
         
+        place_ids = [place['place_id'] for place in basic_results if place.get('place_id')]
+        place_store.upsert_places(basic_results)
+        enrichment.enqueue_places(place_ids)
+        review_signals = place_store.get_review_signals(place_ids)
+        enriched = place_store.get_enrichment(place_ids)
+        
         # Process detailed results
         detailed_results = []
         with_websites = 0
         total_rating = 0
         valid_ratings = 0
         
-        for restaurant in basic_results:
-            # Add fields that frontend expects
-            restaurant['keywords_found'] = 'No website'
-            restaurant['website'] = None
-            # Preserve the actual user_ratings_total from Google Places API (don't overwrite with rating)
-            if 'user_ratings_total' not in restaurant or restaurant['user_ratings_total'] is None:
-                restaurant['user_ratings_total'] = 0  # Default to 0 if missing
-            restaurant['formatted_address'] = restaurant.get('address', '')
-            restaurant['business_status'] = 'OPERATIONAL'  # Default status
-            restaurant['price_level_display'] = PRICE_LEVELS.get(restaurant.get('price_level', 2), '$$')
-            restaurant['ma_score'] = 50  # Default M&A score
+        for place in basic_results:
+            place_id = place.get('place_id')
+            position = place.get('geometry', {}).get('location', {})
+            lat, lng = position.get('lat'), position.get('lng')
+            address = place.get('formatted_address')
+            photos = place.get('photos')
+            
+            # Serialize each Google result once, straight into the shape the frontend expects
+            restaurant = {
+                'name': place.get('name'),
+                'place_id': place_id,
+                'rating': place.get('rating'),
+                # Preserve the actual user_ratings_total from Google Places API (don't overwrite with rating)
+                'user_ratings_total': place.get('user_ratings_total') or 0,
+                'address': address,
+                'formatted_address': address,
+                'price_level': place.get('price_level'),
+                'price_level_display': PRICE_LEVELS.get(place.get('price_level'), '$$'),
+                'photo_reference': photos[0].get('photo_reference') if photos else None,
+                'types': place.get('types', []),
+                'lat': lat,
+                'lng': lng,
+                'coordinates': {'lat': lat, 'lng': lng} if lat and lng else None,
+                'business_status': 'OPERATIONAL',  # Default status
+                'ma_score': 50,  # Default M&A score
+                'keywords_found': 'No website',
+                'website': None,
+                # Review-derived acquisition signals, when review_signals.py has processed this place
+                **review_signals.get(place_id, {}),
+                # Website and keywords, once the enrichment pipeline has reached this place
+                **enriched.get(place_id, {})
+            }
+            if restaurant['website']:
+                with_websites += 1
             
             # Ensure coordinates are preserved for mapping (should already be there from search_restaurants)
             if restaurant.get('lat') and restaurant.get('lng'):
@@ -407,6 +469,26 @@ def search_restaurants_endpoint():
             'message': str(e)
         }), 500
 
+@app.route('/place_details')
+def place_details_endpoint():
+    """Details for one place; also keeps its full review text for review_signals.py"""
+    try:
+        place_id = request.args.get('place_id')
+        if not place_id:
+            return jsonify({'error': 'place_id parameter required'}), 400
+
+        details = get_restaurant_details(place_id)
+        if details is None:
+            return jsonify({'status': 'error', 'message': 'Place not found'}), 404
+
+        details['place_id'] = place_id
+        return jsonify({'status': 'success', 'result': details})
+
+    except requests.exceptions.RequestException as e:
+        return jsonify({'error': f'API request failed: {str(e)}'}), 500
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
 @app.route('/scan_website', methods=['POST'])
 def scan_website_endpoint():
     """Scan individual restaurant website for keywords"""
@@ -438,13 +520,24 @@ def scan_website_endpoint():
 
 @app.route('/api/scrape-website', methods=['POST'])
 def scrape_website():
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
     url = data.get('url')
     
     if not url:
         return jsonify({'error': 'URL required'}), 400
     
-    result = scraper.scrape_website(url)
+    # Optional bounded crawl of linked same-domain pages instead of the landing page only
+    if data.get('crawl'):
+        try:
+            max_depth = int(data.get('max_depth', 2))
+            max_pages = int(data.get('max_pages', 10))
+        except (TypeError, ValueError):
+            return jsonify({'error': f"Invalid max_depth or max_pages: {data.get('max_depth')}, {data.get('max_pages')}"}), 400
+
+        # crawl_website clamps both to CRAWL_MAX_DEPTH / CRAWL_MAX_PAGES
+        result = scraper.crawl_website(url, max_depth=max_depth, max_pages=max_pages)
+    else:
+        result = scraper.scrape_website(url)
     return jsonify(result)
 
 @app.route('/geocode')
@@ -454,11 +547,7 @@ def geocode():
         if not address:
             return jsonify({'error': 'Address parameter required'}), 400
             
-        response = requests.get(
-            'https://maps.googleapis.com/maps/api/geocode/json',
-            params={'address': address, 'key': GOOGLE_API_KEY},
-            timeout=10
-        )
+        response = upstream.get('geocode', {'address': address, 'key': GOOGLE_API_KEY})
         response.raise_for_status()  # Raise exception for bad status codes
         return jsonify(response.json())
         
@@ -477,17 +566,13 @@ def places():
         if not query or not location:
             return jsonify({'error': 'Query and location parameters required'}), 400
             
-        response = requests.get(
-            'https://maps.googleapis.com/maps/api/place/textsearch/json',
-            params={
-                'query': f'{query} restaurant',
-                'location': location,
-                'radius': radius,
-                'type': 'restaurant',
-                'key': GOOGLE_API_KEY
-            },
-            timeout=10
-        )
+        response = upstream.get('textsearch', {
+            'query': f'{query} restaurant',
+            'location': location,
+            'radius': radius,
+            'type': 'restaurant',
+            'key': GOOGLE_API_KEY
+        })
         response.raise_for_status()
         data = response.json()
         
@@ -506,15 +591,116 @@ def places():
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
+@app.route('/photo/<path:reference>')
+def photo(reference):
+    """Serve a resized place photo, fetching from Google only on a cache miss"""
+    size = request.args.get('size', 'thumb')
+    if size not in PHOTO_SIZES:
+        return jsonify({'error': f"Unknown size '{size}', expected one of {list(PHOTO_SIZES)}"}), 400
+
+    image = photo_cache.get(reference, size)
+    if image is None:
+        try:
+            response = upstream.get('photo', {
+                'photo_reference': reference,
+                'maxwidth': SOURCE_MAX_WIDTH,
+                'key': GOOGLE_API_KEY
+            })
+            response.raise_for_status()
+            if not response.headers.get('Content-Type', '').startswith('image/'):
+                return jsonify({'error': 'Photo not available'}), 404
+
+            print(f"🖼️ Photo cache miss - fetched {len(response.content)} bytes from Google")
+            image = photo_cache.put(reference, response.content)[size]
+
+        except requests.exceptions.RequestException as e:
+            return jsonify({'error': f'API request failed: {str(e)}'}), 502
+        except Exception as e:
+            return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+    # Photo references never change their image, so browsers may keep it for a year
+    return Response(image, mimetype=sniff_mimetype(image), headers={
+        'Cache-Control': 'public, max-age=31536000, immutable'
+    })
+
+@app.route('/clusters')
+def clusters():
+    """Return precomputed marker clusters for a map viewport and zoom level"""
+    try:
+        bbox = request.args.get('bbox')
+        zoom = request.args.get('zoom')
+        if not bbox or zoom is None:
+            return jsonify({'error': 'bbox (south,west,north,east) and zoom parameters required'}), 400
+
+        try:
+            south, west, north, east = map(float, bbox.split(','))
+            zoom = int(float(zoom))
+        except ValueError:
+            return jsonify({'error': f'Invalid bbox or zoom: {bbox}, {zoom}'}), 400
+
+        results = cluster_index.query(south, west, north, east, zoom)
+
+        return jsonify({
+            'status': 'success',
+            'zoom': zoom,
+            'clusters': results,
+            'total_places': cluster_index.total_places
+        })
+
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+@app.route('/heatmap')
+def heatmap():
+    """Return market density aggregates for a bounding box at a geohash resolution"""
+    try:
+        bbox = request.args.get('bbox')
+        resolution = request.args.get('resolution', '5')
+        if not bbox:
+            return jsonify({'error': 'bbox (south,west,north,east) parameter required'}), 400
+
+        try:
+            south, west, north, east = map(float, bbox.split(','))
+            resolution = clamp_precision(resolution)
+        except ValueError:
+            return jsonify({'error': f'Invalid bbox or resolution: {bbox}, {resolution}'}), 400
+
+        cells = market_density.query(south, west, north, east, resolution)
+
+        return jsonify({
+            'status': 'success',
+            'resolution': resolution,
+            'cells': cells,
+            'total_places': len(market_density.places)
+        })
+
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+@app.route('/enrichment/status')
+def enrichment_status():
+    """Progress of the background enrichment pipeline"""
+    return jsonify({'status': 'success', 'enrichment': enrichment.progress()})
+
 @app.route('/health')
 def health():
-    return jsonify({'status': 'healthy', 'message': 'M&A Dashboard API is running'})
+    return jsonify({
+        'status': 'healthy',
+        'message': 'M&A Dashboard API is running',
+        'upstream': upstream.get_stats()
+    })
 
 if __name__ == '__main__':
     print("Starting M&A Dashboard API server...")
     print("Geocoding endpoint: http://localhost:5000/geocode")
     print("Places endpoint: http://localhost:5000/places")
+    print("Place details endpoint: http://localhost:5000/place_details?place_id=<id>")
     print("Enhanced search endpoint: http://localhost:5000/search_restaurants")
     print("Web scraping endpoint: http://localhost:5000/api/scrape-website")
+    print("Photo endpoint: http://localhost:5000/photo/<reference>?size=thumb")
+    print("Map clusters endpoint: http://localhost:5000/clusters?bbox=S,W,N,E&zoom=10")
+    print("Market heatmap endpoint: http://localhost:5000/heatmap?bbox=S,W,N,E&resolution=5")
+    print("Enrichment status: http://localhost:5000/enrichment/status")
     print("Health check: http://localhost:5000/health")
+    
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
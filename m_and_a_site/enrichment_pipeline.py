@@ -0,0 +1,261 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_QUEUE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'enrichment_queue.db')
+
+# Stage name -> (worker threads, next stage)
+STAGES = {
+    'details': (4, 'website'),   # Places Details lookup for the website URL
+    'website': (2, 'scan'),      # Normalize the URL with clean_website_url
+    'scan': (2, None)            # Playwright same-domain keyword crawl
+}
+
+MAX_ATTEMPTS = 4
+RETRY_BASE_SECONDS = 30
+
+# A job that used up its attempts is given a fresh set when re-enqueued after this long
+FAILED_RETRY_COOLDOWN = 6 * 60 * 60
+
+# An upstream stage stops claiming work while the next stage has this many jobs waiting
+BACKPRESSURE_LIMIT = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    place_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    payload TEXT,
+    error TEXT,
+    updated_at REAL,
+    PRIMARY KEY (place_id, stage)
+);
+
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (stage, status, next_attempt_at);
+"""
+
+
+class WorkQueue:
+    """Persistent per-stage job queue in SQLite; survives restarts"""
+
+    def __init__(self, db_path):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+        # Jobs that were running when the process stopped go back in line
+        self.conn.execute("UPDATE jobs SET status = 'pending' WHERE status = 'running'")
+        self.conn.commit()
+
+    def enqueue(self, stage, place_ids, payload=None):
+        """Add jobs; places already queued are left alone unless they failed more than FAILED_RETRY_COOLDOWN ago"""
+        now = time.time()
+        encoded = json.dumps(payload) if payload is not None else None
+        with self.lock:
+            cursor = self.conn.executemany("""
+                INSERT INTO jobs (place_id, stage, payload, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(place_id, stage) DO UPDATE SET
+                    status = 'pending',
+                    attempts = 0,
+                    next_attempt_at = 0,
+                    payload = excluded.payload,
+                    updated_at = excluded.updated_at
+                WHERE jobs.status = 'failed' AND jobs.updated_at < ?
+            """, [(place_id, stage, encoded, now, now - FAILED_RETRY_COOLDOWN) for place_id in place_ids])
+            self.conn.commit()
+        return cursor.rowcount
+
+    def claim(self, stage, limit):
+        """Atomically mark up to limit due jobs as running and return them"""
+        now = time.time()
+        with self.lock:
+            rows = self.conn.execute("""
+                SELECT place_id, payload, attempts FROM jobs
+                WHERE stage = ? AND status = 'pending' AND next_attempt_at <= ?
+                ORDER BY next_attempt_at
+                LIMIT ?
+            """, (stage, now, limit)).fetchall()
+
+            self.conn.executemany(
+                "UPDATE jobs SET status = 'running', updated_at = ? WHERE place_id = ? AND stage = ?",
+                [(now, row[0], stage) for row in rows]
+            )
+            self.conn.commit()
+
+        return [(place_id, json.loads(payload) if payload else None, attempts)
+                for place_id, payload, attempts in rows]
+
+    def complete(self, stage, place_id, next_stage=None, next_payload=None):
+        """Finish a job and hand the place to the next stage in the same transaction"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = 'done', error = NULL, updated_at = ? WHERE place_id = ? AND stage = ?",
+                (now, place_id, stage)
+            )
+            if next_stage:
+                self.conn.execute("""
+                    INSERT OR REPLACE INTO jobs (place_id, stage, status, attempts, next_attempt_at, payload, updated_at)
+                    VALUES (?, ?, 'pending', 0, 0, ?, ?)
+                """, (place_id, next_stage, json.dumps(next_payload), now))
+            self.conn.commit()
+
+    def fail(self, stage, place_id, attempts, error):
+        """Schedule a retry with exponential backoff, or give up after MAX_ATTEMPTS"""
+        now = time.time()
+        attempts += 1
+        status = 'failed' if attempts >= MAX_ATTEMPTS else 'pending'
+        next_attempt_at = now + RETRY_BASE_SECONDS * (2 ** (attempts - 1))
+        with self.lock:
+            self.conn.execute("""
+                UPDATE jobs SET status = ?, attempts = ?, next_attempt_at = ?, error = ?, updated_at = ?
+                WHERE place_id = ? AND stage = ?
+            """, (status, attempts, next_attempt_at, str(error)[:500], now, place_id, stage))
+            self.conn.commit()
+
+    def pending_count(self, stage):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE stage = ? AND status IN ('pending', 'running')", (stage,)
+            ).fetchone()[0]
+
+    def counts(self):
+        """Return {stage: {status: count}}"""
+        with self.lock:
+            rows = self.conn.execute("SELECT stage, status, COUNT(*) FROM jobs GROUP BY stage, status").fetchall()
+
+        counts = {stage: {'pending': 0, 'running': 0, 'done': 0, 'failed': 0} for stage in STAGES}
+        for stage, status, count in rows:
+            counts.setdefault(stage, {})[status] = count
+        return counts
+
+
+class EnrichmentPipeline:
+    """Background search -> details -> website -> keyword scan enrichment"""
+
+    def __init__(self, queue, store, fetch_details, clean_url, scraper, poll_interval=2):
+        self.queue = queue
+        self.store = store
+        self.fetch_details = fetch_details
+        self.clean_url = clean_url
+        self.scraper = scraper
+        self.poll_interval = poll_interval
+
+        self.handlers = {
+            'details': self._run_details,
+            'website': self._run_website,
+            'scan': self._run_scan
+        }
+        self.completed = {stage: 0 for stage in STAGES}
+        self.completed_lock = threading.Lock()  # Incremented from every stage's worker threads
+        self.start_lock = threading.Lock()
+        self.started_at = None
+        self.stop_event = threading.Event()
+        self.threads = []
+
+    def enqueue_places(self, place_ids):
+        """Queue places for enrichment; already-known places are skipped"""
+        added = self.queue.enqueue('details', place_ids)
+        if added:
+            print(f"🧵 Enrichment: queued {added} new places for details lookup")
+        return added
+
+    def start(self):
+        """Start the stage dispatchers once; later calls are no-ops"""
+        with self.start_lock:
+            if self.threads:
+                return
+            self._start_threads()
+
+    def _start_threads(self):
+        self.started_at = time.time()
+        for stage, (workers, _) in STAGES.items():
+            thread = threading.Thread(target=self._dispatch, args=(stage, workers),
+                                      name=f'enrichment-{stage}', daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        print(f"🧵 Enrichment pipeline started: {', '.join(f'{s} x{w}' for s, (w, _) in STAGES.items())}")
+
+    def stop(self):
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join()
+
+    def _dispatch(self, stage, workers):
+        """Claim due jobs for one stage and run them on its own worker pool"""
+        next_stage = STAGES[stage][1]
+        in_flight = threading.Semaphore(workers * 2)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'enrich-{stage}') as pool:
+            while not self.stop_event.is_set():
+                # Hold off while the next stage is backed up
+                if next_stage and self.queue.pending_count(next_stage) >= BACKPRESSURE_LIMIT:
+                    self.stop_event.wait(self.poll_interval)
+                    continue
+
+                jobs = self.queue.claim(stage, workers)
+                if not jobs:
+                    self.stop_event.wait(self.poll_interval)
+                    continue
+
+                for place_id, payload, attempts in jobs:
+                    in_flight.acquire()
+                    future = pool.submit(self._run_job, stage, place_id, payload, attempts)
+                    future.add_done_callback(lambda _: in_flight.release())
+
+    def _run_job(self, stage, place_id, payload, attempts):
+        try:
+            next_stage, next_payload = self.handlers[stage](place_id, payload)
+            self.queue.complete(stage, place_id, next_stage, next_payload)
+            with self.completed_lock:
+                self.completed[stage] += 1
+        except Exception as e:
+            print(f"⚠️ Enrichment {stage} failed for {place_id} (attempt {attempts + 1}): {e}")
+            self.queue.fail(stage, place_id, attempts, e)
+
+    def _run_details(self, place_id, payload):
+        details = self.fetch_details(place_id)
+        if details is None:
+            raise ValueError('No details returned')
+        return 'website', {'website': details.get('website')}
+
+    def _run_website(self, place_id, payload):
+        website = self.clean_url(payload.get('website'))
+        if not website:
+            self.store.save_enrichment(place_id, None, 'No website')
+            return None, None
+
+        self.store.save_enrichment(place_id, website, 'Not scanned')
+        return 'scan', {'website': website}
+
+    def _run_scan(self, place_id, payload):
+        website = payload['website']
+        result = self.scraper.crawl_website(website)
+        if not result.get('success'):
+            raise RuntimeError(result.get('error', 'Scan failed'))
+
+        keywords = result.get('found_keywords', [])
+        self.store.save_enrichment(place_id, website, ', '.join(keywords) if keywords else 'None found',
+                                   len(keywords))
+        return None, None
+
+    def progress(self):
+        """Queue depth per stage plus completion rate since start"""
+        elapsed = time.time() - self.started_at if self.started_at else 0
+        with self.completed_lock:
+            completed = dict(self.completed)
+        return {
+            'running': bool(self.threads) and not self.stop_event.is_set(),
+            'stages': self.queue.counts(),
+            'completed_since_start': completed,
+            'per_minute': {stage: round(count / elapsed * 60, 1) if elapsed else 0
+                           for stage, count in completed.items()}
+        }
@@ -225,9 +225,14 @@ class GooglePlacesAPI {
             this.requestCount.details++;
             console.log(`API Cost Tracker - Details calls: ${this.requestCount.details} (~$${(this.requestCount.details * 0.017).toFixed(3)})`);
             
-            // For now, return basic info since Flask backend doesn't have place details endpoint
-            console.log('Place details not implemented in Flask backend yet');
-            return null;
+            const response = await fetch(`${this.baseUrl}/place_details?place_id=${encodeURIComponent(placeId)}`);
+            const data = await response.json();
+            
+            if (!response.ok || data.status !== 'success') {
+                throw new Error(data.error || data.message || 'Details request failed');
+            }
+            
+            return data.result;
             
         } catch (error) {
             console.error('Place details error:', error);
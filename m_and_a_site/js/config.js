@@ -11,7 +11,9 @@ const CONFIG = {
     ENDPOINTS: {
         PLACES_SEARCH: 'https://maps.googleapis.com/maps/api/place/textsearch/json',
         PLACE_DETAILS: 'https://maps.googleapis.com/maps/api/place/details/json',
-        GEOCODING: 'https://maps.googleapis.com/maps/api/geocode/json'
+        GEOCODING: 'https://maps.googleapis.com/maps/api/geocode/json',
+        PHOTO: 'http://localhost:5000/photo', // Flask proxy, serves cached resized photos
+        CLUSTERS: 'http://localhost:5000/clusters' // Flask proxy, precomputed marker clusters
     },
     
     // Default Settings
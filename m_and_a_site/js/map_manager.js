@@ -12,6 +12,12 @@ class MapManager {
         this.markerCluster = null;
         this.isInitialized = false;
         
+        // Server-side clustering state ("show all stored places" mode)
+        this.clusterMode = false;
+        this.clusterRequestId = 0;
+        this.clusterToggle = null;
+        this.lastRestaurants = [];
+        
         // Map state
         this.currentBounds = null;
         this.currentCenter = CONFIG.DEFAULTS.MAP_CENTER;
@@ -64,6 +70,7 @@ class MapManager {
             
             // Add map event listeners
             this.setupMapEventListeners();
+            this.setupClusterToggle();
             
             console.log('Google Map initialized successfully');
             return true;
@@ -93,6 +100,13 @@ class MapManager {
             this.currentBounds = this.map.getBounds();
         });
 
+        // Refresh server-side clusters once panning/zooming settles
+        this.map.addListener('idle', () => {
+            if (this.clusterMode) {
+                this.loadClusters();
+            }
+        });
+
         // Handle map clicks (close info windows)
         this.map.addListener('click', () => {
             this.closeAllInfoWindows();
@@ -113,6 +127,7 @@ class MapManager {
 
         // Clear existing markers
         this.clearMarkers();
+        this.lastRestaurants = restaurants;
 
         // Debug: Check first few restaurants for coordinates
         console.log('🗺️ Frontend: Checking coordinates for first 5 restaurants:');
@@ -241,6 +256,139 @@ class MapManager {
         processBatch();
     }
 
+    /**
+     * Add a map control that switches between search results and all stored places
+     */
+    setupClusterToggle() {
+        const button = document.createElement('button');
+        button.type = 'button';
+        button.style.cssText = 'margin: 10px; padding: 6px 12px; background: white; border: none; border-radius: 4px; ' +
+            'box-shadow: 0 1px 4px rgba(0,0,0,0.3); cursor: pointer; font-size: 0.9em;';
+        button.addEventListener('click', () => {
+            this.showStoredPlaces(!this.clusterMode);
+        });
+
+        this.clusterToggle = button;
+        this.updateClusterToggle();
+        this.map.controls[google.maps.ControlPosition.TOP_LEFT].push(button);
+    }
+
+    /**
+     * Keep the toggle label in sync with the current mode
+     */
+    updateClusterToggle() {
+        if (this.clusterToggle) {
+            this.clusterToggle.textContent = this.clusterMode ? '📍 Show search results' : '🗺️ Show all stored places';
+        }
+    }
+
+    /**
+     * Switch the map to server-side clusters of every stored place, or back to the last search results
+     * @param {boolean} enabled - True to show stored-place clusters
+     */
+    showStoredPlaces(enabled) {
+        if (!this.isInitialized || !this.map) return;
+
+        if (enabled) {
+            console.log('🗺️ Frontend: Showing all stored places as server-side clusters');
+            this.removeMarkers();
+            this.clusterMode = true;
+            this.updateClusterToggle();
+            this.loadClusters();
+        } else {
+            this.addRestaurantMarkers(this.lastRestaurants);
+        }
+    }
+
+    /**
+     * Fetch clusters for the current viewport and zoom from the proxy and draw them
+     */
+    async loadClusters() {
+        const mapBounds = this.map.getBounds();
+        if (!mapBounds) return;
+
+        const ne = mapBounds.getNorthEast();
+        const sw = mapBounds.getSouthWest();
+        const zoom = this.map.getZoom();
+        const requestId = ++this.clusterRequestId;
+
+        try {
+            const bbox = [sw.lat(), sw.lng(), ne.lat(), ne.lng()].join(',');
+            const response = await fetch(`${CONFIG.ENDPOINTS.CLUSTERS}?bbox=${bbox}&zoom=${zoom}`);
+            const data = await response.json();
+
+            if (!response.ok) {
+                throw new Error(data.error || 'Cluster request failed');
+            }
+
+            // Ignore responses for viewports the user has already moved away from
+            if (requestId !== this.clusterRequestId || !this.clusterMode) return;
+
+            this.removeMarkers();
+            data.clusters.forEach(cluster => {
+                const marker = cluster.count === 1
+                    ? this.createRestaurantMarker({
+                        place_id: cluster.place_id,
+                        name: cluster.name,
+                        lat: cluster.lat,
+                        lng: cluster.lng,
+                        ma_score: cluster.avg_ma_score
+                    }, 0)
+                    : this.createClusterMarker(cluster);
+                if (marker) {
+                    this.markers.push(marker);
+                }
+            });
+
+            console.log(`🗺️ Frontend: Drew ${data.clusters.length} clusters at zoom ${zoom} (${data.total_places} places stored)`);
+
+        } catch (error) {
+            console.error('❌ Frontend: Error loading clusters:', error);
+        }
+    }
+
+    /**
+     * Create a marker for a server-side cluster
+     * @param {Object} cluster - Cluster with lat, lng, count, avg_ma_score and bounds
+     * @returns {google.maps.Marker} Google Maps marker
+     */
+    createClusterMarker(cluster) {
+        const score = cluster.avg_ma_score || 0;
+        let color = '#dc3545';
+        if (score >= 80) color = '#28a745';
+        else if (score >= 65) color = '#17a2b8';
+        else if (score >= 50) color = '#ffc107';
+        else if (score >= 35) color = '#fd7e14';
+
+        const size = Math.min(60, 26 + Math.log10(cluster.count) * 10);
+        const svgMarker = `
+            <svg width="${size}" height="${size}" viewBox="0 0 40 40" xmlns="http://www.w3.org/2000/svg">
+                <circle cx="20" cy="20" r="18" fill="${color}" fill-opacity="0.85" stroke="white" stroke-width="2"/>
+                <text x="20" y="25" font-family="Arial" font-size="12" font-weight="bold" fill="white" text-anchor="middle">${cluster.count}</text>
+            </svg>
+        `;
+
+        const marker = new google.maps.Marker({
+            position: { lat: cluster.lat, lng: cluster.lng },
+            map: this.map,
+            title: `${cluster.count} restaurants (avg M&A score ${score})`,
+            icon: {
+                url: 'data:image/svg+xml;charset=UTF-8,' + encodeURIComponent(svgMarker),
+                scaledSize: new google.maps.Size(size, size),
+                anchor: new google.maps.Point(size / 2, size / 2)
+            },
+            zIndex: cluster.count
+        });
+
+        // Zoom into the cluster's extent on click
+        marker.addListener('click', () => {
+            const { south, west, north, east } = cluster.bounds;
+            this.map.fitBounds({ south, west, north, east });
+        });
+
+        return marker;
+    }
+
     /**
      * Finalize map bounds after all markers are created
      * @param {google.maps.LatLngBounds} bounds - Bounds object
@@ -433,6 +581,9 @@ class MapManager {
         const phone = restaurant.formatted_phone_number || '';
         const website = restaurant.website || '';
         const status = restaurant.business_status || 'Unknown';
+        const photoUrl = restaurant.photo_reference
+            ? `${CONFIG.ENDPOINTS.PHOTO}/${encodeURIComponent(restaurant.photo_reference)}?size=info`
+            : '';
 
         // Score color
         let scoreColor = '#6c757d';
@@ -444,6 +595,7 @@ class MapManager {
 
         return `
             <div style="padding: 15px; max-width: 350px; font-family: 'Segoe UI', sans-serif;">
+                ${photoUrl ? `<img src="${photoUrl}" alt="${name}" loading="lazy" style="width: 100%; max-height: 180px; object-fit: cover; border-radius: 4px; margin-bottom: 10px;">` : ''}
                 <h3 style="margin: 0 0 10px 0; color: #2c3e50; font-size: 1.2em;">${name}</h3>
                 
                 <div style="margin-bottom: 15px;">
@@ -508,6 +660,17 @@ class MapManager {
     clearMarkers() {
         console.log('Clearing existing markers');
         
+        // Leaving stored-places mode, otherwise the next idle event would redraw the clusters
+        this.clusterMode = false;
+        this.lastRestaurants = [];
+        this.updateClusterToggle();
+        this.removeMarkers();
+    }
+
+    /**
+     * Remove markers and info windows from the map without changing the display mode
+     */
+    removeMarkers() {
         this.markers.forEach(marker => {
             marker.setMap(null);
         });
@@ -621,6 +784,7 @@ class MapManager {
         
         this.map = null;
         this.isInitialized = false;
+        this.clusterMode = false;
         this.markers = [];
         this.infoWindows = [];
     }
@@ -487,7 +487,7 @@ class UIController {
         if (!restaurants || restaurants.length === 0) {
             this.elements.targetsTableBody.innerHTML = `
                 <tr>
-                    <td colspan="9" style="text-align: center; color: #6c757d; padding: 20px;">
+                    <td colspan="10" style="text-align: center; color: #6c757d; padding: 20px;">
                         ${CONFIG.MESSAGES.NO_RESULTS}
                     </td>
                 </tr>
@@ -588,6 +588,9 @@ class UIController {
     const maScore = restaurant.ma_score || 0;
     const address = restaurant.formatted_address || 'Address not available';
     const placeId = restaurant.place_id || '';
+    const photo = restaurant.photo_reference
+        ? `<img src="${CONFIG.ENDPOINTS.PHOTO}/${encodeURIComponent(restaurant.photo_reference)}?size=thumb" alt="" loading="lazy" width="48" height="48" style="object-fit: cover; border-radius: 4px;">`
+        : '';
     
     // Status color
     const statusColor = status === 'OPERATIONAL' ? '#28a745' : '#dc3545';
@@ -603,6 +606,7 @@ class UIController {
     return `
         <tr>
             <td>${rank}</td>
+            <td>${photo}</td>
             <td><strong>${name}</strong></td>
             <td>${rating} ⭐</td>
             <td>${reviews}</td>
@@ -647,7 +651,7 @@ class UIController {
         if (loading && this.elements.targetsTableBody) {
             this.elements.targetsTableBody.innerHTML = `
                 <tr>
-                    <td colspan="9" class="loading">
+                    <td colspan="10" class="loading">
                         ${CONFIG.MESSAGES.SEARCH_IN_PROGRESS}
                     </td>
                 </tr>
@@ -671,7 +675,7 @@ class UIController {
         if (this.elements.targetsTableBody) {
             this.elements.targetsTableBody.innerHTML = `
                 <tr>
-                    <td colspan="9" style="text-align: center; color: #dc3545; padding: 20px;">
+                    <td colspan="10" style="text-align: center; color: #dc3545; padding: 20px;">
                         Error: ${message}
                     </td>
                 </tr>
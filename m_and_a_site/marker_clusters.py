@@ -0,0 +1,264 @@
+import math
+import threading
+import time
+
+# Zoom levels that get precomputed clusters; above MAX_ZOOM individual places are returned
+MIN_ZOOM = 0
+MAX_ZOOM = 16
+
+# Points closer than this many screen pixels at a zoom level share a cluster
+CLUSTER_RADIUS_PX = 60
+TILE_SIZE = 256
+
+# Mirrors DataAnalyzer.hasChainIndicators in js/data_analyzer.js
+CHAIN_KEYWORDS = [
+    'pizza', 'burger', 'chicken', 'taco', 'subway', 'mcdonald',
+    'kfc', 'domino', 'papa', 'sonic', 'dairy queen', 'wendy',
+    'franchise', 'chain', 'corporate', 'inc', 'llc'
+]
+FRANCHISE_TYPES = ['meal_takeaway', 'fast_food', 'restaurant']
+
+# Mirrors DataAnalyzer.hasLocationQualityIndicators
+QUALITY_LOCATION_TYPES = [
+    'shopping_mall', 'tourist_attraction', 'transit_station',
+    'university', 'school', 'hospital', 'airport'
+]
+
+
+def calculate_ma_score(place):
+    """Python port of DataAnalyzer.calculateMAScore for places in the store"""
+    score = 0
+
+    rating = place.rating or 0
+    score += (rating / 5) * 40
+
+    reviews = place.user_ratings_total or 0
+    if reviews >= 1000:
+        score += 30
+    elif reviews >= 500:
+        score += 25
+    elif reviews >= 100:
+        score += 15
+    elif reviews >= 50:
+        score += 10
+
+    price_level = place.price_level or 0
+    if price_level == 2:
+        score += 20
+    elif price_level in (1, 3):
+        score += 15
+    elif price_level == 4:
+        score += 5
+
+    # Stored places are all treated as OPERATIONAL, as the search endpoint does
+    score += 10
+
+    # Chain/franchise bonus: name keywords or franchise-friendly types
+    name = (place.name or '').lower()
+    if any(keyword in name for keyword in CHAIN_KEYWORDS) or any(t in place.types for t in FRANCHISE_TYPES):
+        score += 5
+
+    # Location quality bonus
+    if any(t in place.types for t in QUALITY_LOCATION_TYPES):
+        score += 5
+
+    return round(min(score, 100))
+
+
+def project(lat, lng):
+    """Web Mercator projection to the unit square (x right, y down)"""
+    x = (lng + 180) / 360
+    sin_lat = min(max(math.sin(math.radians(lat)), -0.9999), 0.9999)
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return x, y
+
+
+def unproject_lat(y):
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y))))
+
+
+def cells_per_side(zoom):
+    return TILE_SIZE * (2 ** zoom) / CLUSTER_RADIUS_PX
+
+
+class ClusterIndex:
+    """Quadtree grid clusters of the place store, one level per zoom, updated as places are written.
+
+    A cell at one zoom covers exactly four cells at the next, so each place sits in one cell per
+    level and a write only touches the cells along its path.
+    """
+
+    def __init__(self):
+        self.levels = {zoom: {} for zoom in range(MIN_ZOOM, MAX_ZOOM + 1)}  # zoom -> {(cell_x, cell_y): cluster}
+        self.grid = [(zoom, level, cells_per_side(zoom)) for zoom, level in self.levels.items()]
+        self.leaves = {}   # (cell_x, cell_y) at MAX_ZOOM -> {place_id: leaf}
+        self.places = {}   # place_id -> leaf currently counted in the levels
+        self.lock = threading.Lock()
+
+    @property
+    def total_places(self):
+        return len(self.places)
+
+    def update_places(self, places):
+        """Fold newly written or refreshed PlaceRecords into the clusters"""
+        started = time.time()
+        with self.lock:
+            for place in places:
+                if not place.place_id or place.lat is None or place.lng is None:
+                    continue
+
+                x, y = project(place.lat, place.lng)
+                leaf = {
+                    'x': x, 'y': y, 'count': 1,
+                    'score_sum': calculate_ma_score(place),
+                    'south': place.lat, 'north': place.lat,
+                    'west': place.lng, 'east': place.lng,
+                    'place_id': place.place_id, 'name': place.name
+                }
+
+                old = self.places.get(place.place_id)
+                if old == leaf:
+                    continue
+                if old is not None:
+                    self._remove(old)
+                self._add(leaf)
+
+        if len(places) > 1000:
+            print(f"🗺️ Cluster index: {len(places)} places indexed in {time.time() - started:.2f}s, "
+                  f"{len(self.levels[MIN_ZOOM])}-{len(self.levels[MAX_ZOOM])} clusters per zoom")
+
+    def _add(self, leaf):
+        place_id, x, y = leaf['place_id'], leaf['x'], leaf['y']
+        lat, lng, score = leaf['south'], leaf['west'], leaf['score_sum']
+        self.places[place_id] = leaf
+
+        for zoom, level, cells in self.grid:
+            key = (int(x * cells), int(y * cells))
+            if zoom == MAX_ZOOM:
+                self.leaves.setdefault(key, {})[place_id] = leaf
+
+            cluster = level.get(key)
+            if cluster is None:
+                # 'leaf' is only kept while the cluster holds a single place
+                level[key] = {'count': 1, 'x_sum': x, 'y_sum': y, 'score_sum': score,
+                              'south': lat, 'west': lng, 'north': lat, 'east': lng, 'leaf': leaf}
+                continue
+
+            cluster.pop('leaf', None)
+            cluster['count'] += 1
+            cluster['x_sum'] += x
+            cluster['y_sum'] += y
+            cluster['score_sum'] += score
+            if lat < cluster['south']:
+                cluster['south'] = lat
+            elif lat > cluster['north']:
+                cluster['north'] = lat
+            if lng < cluster['west']:
+                cluster['west'] = lng
+            elif lng > cluster['east']:
+                cluster['east'] = lng
+
+    def _remove(self, leaf):
+        del self.places[leaf['place_id']]
+        # Deepest level first so each parent can recompute its bounds from its four children
+        for zoom in range(MAX_ZOOM, MIN_ZOOM - 1, -1):
+            level = self.levels[zoom]
+            cells = cells_per_side(zoom)
+            key = (int(leaf['x'] * cells), int(leaf['y'] * cells))
+            if zoom == MAX_ZOOM:
+                members = self.leaves[key]
+                del members[leaf['place_id']]
+                if not members:
+                    del self.leaves[key]
+
+            cluster = level[key]
+            cluster['count'] -= 1
+            if cluster['count'] == 0:
+                del level[key]
+                continue
+
+            cluster['x_sum'] -= leaf['x']
+            cluster['y_sum'] -= leaf['y']
+            cluster['score_sum'] -= leaf['score_sum']
+
+            if zoom == MAX_ZOOM:
+                parts = self.leaves[key].values()
+            else:
+                below = self.levels[zoom + 1]
+                cx, cy = key
+                parts = [below[child] for child in ((2 * cx, 2 * cy), (2 * cx + 1, 2 * cy),
+                                                    (2 * cx, 2 * cy + 1), (2 * cx + 1, 2 * cy + 1))
+                         if child in below]
+            cluster['south'] = min(part['south'] for part in parts)
+            cluster['west'] = min(part['west'] for part in parts)
+            cluster['north'] = max(part['north'] for part in parts)
+            cluster['east'] = max(part['east'] for part in parts)
+            if cluster['count'] == 1:
+                part = next(iter(parts))
+                cluster['leaf'] = part.get('leaf', part)
+
+    def _cells_in_view(self, level, cells, south, west, north, east):
+        """Yield values from level whose cell overlaps the viewport"""
+        x0, y0 = project(north, west)
+        x1, y1 = project(south, east)
+        cx0, cx1 = int(x0 * cells), int(x1 * cells)
+        cy0, cy1 = int(y0 * cells), int(y1 * cells)
+
+        # Scan whichever is smaller: the viewport's cells or the whole level
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(level):
+            for (cx, cy), value in level.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    yield value
+        else:
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    value = level.get((cx, cy))
+                    if value is not None:
+                        yield value
+
+    def query(self, south, west, north, east, zoom):
+        """Return the clusters whose centroid is inside the viewport at this zoom"""
+        # A viewport crossing the antimeridian is queried as two boxes
+        if west > east:
+            return self.query(south, west, north, 180, zoom) + self.query(south, -180, north, east, zoom)
+
+        zoom = max(MIN_ZOOM, int(zoom))
+        results = []
+        with self.lock:
+            if zoom > MAX_ZOOM:
+                cells = cells_per_side(MAX_ZOOM)
+                candidates = [leaf
+                              for group in self._cells_in_view(self.leaves, cells, south, west, north, east)
+                              for leaf in group.values()]
+            else:
+                # A single-place cluster is drawn as that place
+                candidates = [cluster.get('leaf', cluster)
+                              for cluster in self._cells_in_view(self.levels[zoom], cells_per_side(zoom),
+                                                                 south, west, north, east)]
+
+            for cluster in candidates:
+                count = cluster['count']
+                if count == 1:
+                    x, y = cluster['x'], cluster['y']
+                else:
+                    x, y = cluster['x_sum'] / count, cluster['y_sum'] / count
+                lat, lng = unproject_lat(y), x * 360 - 180
+                if not (south <= lat <= north and west <= lng <= east):
+                    continue
+
+                result = {
+                    'lat': lat,
+                    'lng': lng,
+                    'count': count,
+                    'avg_ma_score': round(cluster['score_sum'] / count, 1),
+                    'bounds': {
+                        'south': cluster['south'], 'west': cluster['west'],
+                        'north': cluster['north'], 'east': cluster['east']
+                    }
+                }
+                if count == 1:
+                    result['place_id'] = cluster['place_id']
+                    result['name'] = cluster['name']
+                results.append(result)
+
+        return results
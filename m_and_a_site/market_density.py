@@ -0,0 +1,234 @@
+import sys
+import threading
+
+from place_records import normalize_brand
+
+GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Geohash precisions maintained; 3 is ~156km cells, 7 is ~150m cells
+MIN_PRECISION = 3
+MAX_PRECISION = 7
+
+# A brand seen at this many stored places counts as a chain
+CHAIN_MIN_LOCATIONS = 3
+
+PRICE_KEYS = ['unknown', '$', '$$', '$$$', '$$$$']
+
+
+def geohash_encode(lat, lng, precision=MAX_PRECISION):
+    """Standard base32 geohash of a coordinate"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lng_range[0] + lng_range[1]) / 2
+            if lng >= mid:
+                bits = (bits << 1) | 1
+                lng_range[0] = mid
+            else:
+                bits <<= 1
+                lng_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits <<= 1
+                lat_range[1] = mid
+        even = not even
+
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+
+def geohash_bounds(geohash):
+    """Return (south, west, north, east) of a geohash cell"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+
+    for char in geohash:
+        value = GEOHASH_BASE32.index(char)
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            target = lng_range if even else lat_range
+            mid = (target[0] + target[1]) / 2
+            if bit:
+                target[0] = mid
+            else:
+                target[1] = mid
+            even = not even
+
+    return lat_range[0], lng_range[0], lat_range[1], lng_range[1]
+
+
+def clamp_precision(precision):
+    """The precision a query at this resolution is actually answered at"""
+    return min(max(int(precision), MIN_PRECISION), MAX_PRECISION)
+
+
+def new_aggregate(geohash):
+    south, west, north, east = geohash_bounds(geohash)
+    return {
+        'count': 0,
+        'rating_sum': 0.0,
+        'rating_count': 0,
+        'review_total': 0,
+        'price_counts': [0] * len(PRICE_KEYS),
+        'chain_count': 0,
+        'bounds': (south, west, north, east)
+    }
+
+
+class MarketDensity:
+    """Geohash-cell aggregates over stored places, updated as places are written"""
+
+    def __init__(self):
+        self.cells = {precision: {} for precision in range(MIN_PRECISION, MAX_PRECISION + 1)}
+        self.places = {}          # place_id -> contribution currently counted in the cells
+        self.brand_places = {}    # brand -> set of place_ids
+        self.lock = threading.Lock()
+
+    def _is_chain(self, brand):
+        return bool(brand) and len(self.brand_places.get(brand, ())) >= CHAIN_MIN_LOCATIONS
+
+    def _apply(self, contribution, sign, chain=None):
+        """Add (sign=1) or remove (sign=-1) one place's contribution from every precision"""
+        geohash, rating, reviews, price_level, brand = contribution
+        if chain is None:
+            chain = self._is_chain(brand)
+
+        for precision, level in self.cells.items():
+            key = geohash[:precision]
+            agg = level.get(key)
+            if agg is None:
+                agg = level[key] = new_aggregate(key)
+
+            agg['count'] += sign
+            if rating is not None:
+                agg['rating_sum'] += sign * rating
+                agg['rating_count'] += sign
+            agg['review_total'] += sign * reviews
+            agg['price_counts'][price_level if price_level in (1, 2, 3, 4) else 0] += sign
+            if chain:
+                agg['chain_count'] += sign
+
+            if agg['count'] == 0:
+                del level[key]
+
+    def _adjust_chain(self, brand, sign):
+        """Flip chain status for every place of a brand that crossed the threshold"""
+        for place_id in self.brand_places[brand]:
+            geohash = self.places[place_id][0]
+            for precision, level in self.cells.items():
+                level[geohash[:precision]]['chain_count'] += sign
+
+    def update_places(self, places):
+        """Fold newly written or refreshed PlaceRecords into the aggregates"""
+        with self.lock:
+            for place in places:
+                place_id = place.place_id
+                if not place_id or place.lat is None or place.lng is None:
+                    continue
+
+                contribution = (
+                    geohash_encode(place.lat, place.lng),
+                    place.rating,
+                    place.user_ratings_total or 0,
+                    place.price_level,
+                    sys.intern(normalize_brand(place.name))  # Shared across the brand's places
+                )
+
+                old = self.places.get(place_id)
+                if old == contribution:
+                    continue
+
+                if old is not None:
+                    self._apply(old, -1)
+                    self._remove_brand(old[4], place_id)
+
+                self.places[place_id] = contribution
+                self._add_brand(contribution[4], place_id)
+                self._apply(contribution, 1)
+
+    def _add_brand(self, brand, place_id):
+        if not brand:
+            return
+        members = self.brand_places.setdefault(brand, set())
+        members.add(place_id)
+        if len(members) == CHAIN_MIN_LOCATIONS:
+            # Existing members were counted as independents until now; the new one is applied afterwards
+            members.discard(place_id)
+            self._adjust_chain(brand, 1)
+            members.add(place_id)
+
+    def _remove_brand(self, brand, place_id):
+        if not brand:
+            return
+        members = self.brand_places[brand]
+        if len(members) == CHAIN_MIN_LOCATIONS:
+            # Dropping below the threshold: the others stop counting as chain locations
+            members.discard(place_id)
+            self._adjust_chain(brand, -1)
+        else:
+            members.discard(place_id)
+        if not members:
+            del self.brand_places[brand]
+
+    def _covering_cells(self, south, west, north, east, precision):
+        """Walk geohash prefixes down to precision, keeping only occupied cells that overlap the box"""
+        prefixes = ['']
+        for length in range(1, precision + 1):
+            level = self.cells.get(length)
+            children = []
+            for prefix in prefixes:
+                for char in GEOHASH_BASE32:
+                    child = prefix + char
+                    # Empty cells are dropped from the aggregates, so a missing prefix has nothing below it
+                    if level is not None and child not in level:
+                        continue
+                    cell_south, cell_west, cell_north, cell_east = geohash_bounds(child)
+                    if cell_north < south or cell_south > north or cell_east < west or cell_west > east:
+                        continue
+                    children.append(child)
+            prefixes = children
+        return prefixes
+
+    def query(self, south, west, north, east, precision):
+        """Return aggregates for every cell at this precision overlapping the bounding box"""
+        # A box crossing the antimeridian is queried as two boxes
+        if west > east:
+            return self.query(south, west, north, 180, precision) + self.query(south, -180, north, east, precision)
+
+        precision = clamp_precision(precision)
+
+        results = []
+        with self.lock:
+            level = self.cells[precision]
+            for geohash in self._covering_cells(south, west, north, east, precision):
+                agg = level[geohash]
+                cell_south, cell_west, cell_north, cell_east = agg['bounds']
+                count = agg['count']
+                results.append({
+                    'geohash': geohash,
+                    'bounds': {'south': cell_south, 'west': cell_west, 'north': cell_north, 'east': cell_east},
+                    'center': {'lat': (cell_south + cell_north) / 2, 'lng': (cell_west + cell_east) / 2},
+                    'place_count': count,
+                    'average_rating': round(agg['rating_sum'] / agg['rating_count'], 2) if agg['rating_count'] else None,
+                    'review_total': agg['review_total'],
+                    'price_mix': dict(zip(PRICE_KEYS, agg['price_counts'])),
+                    'chain_share': round(agg['chain_count'] / count, 3)
+                })
+
+        return results
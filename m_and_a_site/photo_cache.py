@@ -0,0 +1,158 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+    print("❌ Pillow not available - photo resizing is off, thumbnails will be served at original size")
+
+# Variant name -> max width in pixels
+PHOTO_SIZES = {
+    'thumb': 96,    # Results table thumbnail
+    'info': 400     # Map info window
+}
+
+# Width requested from Google; every variant is resized down from this one fetch
+SOURCE_MAX_WIDTH = 800
+
+
+# Variant stored when Pillow is missing; served for every requested size
+ORIGINAL_VARIANT = 'original'
+
+
+def sniff_mimetype(data):
+    """Content type of stored bytes; resized variants are JPEG, originals may not be"""
+    if data.startswith(b'\x89PNG'):
+        return 'image/png'
+    if data.startswith(b'GIF8'):
+        return 'image/gif'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'image/webp'
+    return 'image/jpeg'
+
+
+class PhotoCache:
+    """Size-bounded disk cache of resized place photos, evicted per reference in LRU order"""
+
+    def __init__(self, cache_dir, max_bytes=200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries = OrderedDict()  # reference digest -> {variant: size}, least recently used first
+        self.lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """Rebuild the LRU order from file access times left by previous runs"""
+        files = []
+        for filename in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, filename)
+            if os.path.isfile(path) and '_' in filename and not filename.endswith('.tmp'):
+                stat = os.stat(path)
+                files.append((stat.st_mtime, filename, stat.st_size))
+
+        for _, filename, size in sorted(files):
+            digest, variant = filename.rsplit('.', 1)[0].split('_', 1)
+            variants = self.entries.pop(digest, {})
+            variants[variant] = size
+            self.entries[digest] = variants
+            self.total_bytes += size
+
+        print(f"🖼️ Photo cache: {len(self.entries)} photos, {self.total_bytes / 1024 / 1024:.1f} MB")
+
+    def _digest(self, reference):
+        return hashlib.sha1(reference.encode('utf-8')).hexdigest()
+
+    def _path(self, digest, variant):
+        return os.path.join(self.cache_dir, f"{digest}_{variant}.img")
+
+    def get(self, reference, variant):
+        """Return cached image bytes, or None on a miss"""
+        if not PILLOW_AVAILABLE:
+            variant = ORIGINAL_VARIANT
+        digest = self._digest(reference)
+        path = self._path(digest, variant)
+
+        with self.lock:
+            if variant not in self.entries.get(digest, {}):
+                return None
+            self.entries.move_to_end(digest)
+
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # Persist recency for the next restart
+            return data
+        except OSError:
+            with self.lock:
+                self._remove(digest)
+            return None
+
+    def put(self, reference, image_bytes):
+        """Resize the source image into every variant, store them, and return {variant: bytes}"""
+        variants = resize_variants(image_bytes)
+        digest = self._digest(reference)
+
+        with self.lock:
+            self._remove(digest)
+            for variant, data in variants.items():
+                path = self._path(digest, variant)
+                tmp_path = path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            self.entries[digest] = {variant: len(data) for variant, data in variants.items()}
+            self.total_bytes += sum(self.entries[digest].values())
+
+            self._evict(keep=digest)
+
+        if not PILLOW_AVAILABLE:
+            return {variant: image_bytes for variant in PHOTO_SIZES}
+        return variants
+
+    def _remove(self, digest):
+        """Delete every stored variant of one reference (caller holds the lock)"""
+        variants = self.entries.pop(digest, {})
+        for variant, size in variants.items():
+            self.total_bytes -= size
+            try:
+                os.remove(self._path(digest, variant))
+            except OSError:
+                pass
+        return variants
+
+    def _evict(self, keep=None):
+        """Drop least recently used references, all variants together, until the cache fits"""
+        while self.total_bytes > self.max_bytes and self.entries:
+            digest = next(iter(self.entries))
+            if digest == keep:
+                break
+            self._remove(digest)
+            print(f"🗑️ Photo cache evicted {digest}")
+
+
+def resize_variants(image_bytes):
+    """Produce one JPEG per entry in PHOTO_SIZES, or the original alone when Pillow is missing"""
+    if not PILLOW_AVAILABLE:
+        # Storing the full-size original once per size would only duplicate it
+        return {ORIGINAL_VARIANT: image_bytes}
+
+    variants = {}
+    with Image.open(io.BytesIO(image_bytes)) as source:
+        source = source.convert('RGB')
+        for variant, max_width in PHOTO_SIZES.items():
+            image = source.copy()
+            if image.width > max_width:
+                height = round(image.height * max_width / image.width)
+                image = image.resize((max_width, height), Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, format='JPEG', quality=82, optimize=True)
+            variants[variant] = buffer.getvalue()
+    return variants
@@ -0,0 +1,129 @@
+import math
+import re
+import sys
+from array import array
+
+MISSING = math.nan
+
+
+def normalize_brand(name):
+    """Collapse a place name to a brand key, e.g. "Chipotle Mexican Grill - Downtown" -> "chipotle mexican grill" """
+    brand = (name or '').split(' - ')[0].split(' | ')[0].lower()
+    return re.sub(r'[^a-z0-9 ]+', '', brand).strip()
+
+
+def place_row(place):
+    """Flatten a Places API search or details result to places table column order"""
+    location = place.get('geometry', {}).get('location', {})
+    photos = place.get('photos')
+    return (
+        place.get('place_id'),
+        place.get('name'),
+        place.get('formatted_address'),
+        location.get('lat'),
+        location.get('lng'),
+        place.get('rating'),
+        place.get('user_ratings_total'),
+        place.get('price_level'),
+        photos[0].get('photo_reference') if photos else None,
+        place.get('types', ())
+    )
+
+
+class PlaceRecord:
+    """Read-only view of one PlaceTable row, built on demand and not kept"""
+
+    __slots__ = ('place_id', 'name', 'lat', 'lng', 'rating', 'user_ratings_total', 'price_level', 'types')
+
+    def __init__(self, place_id, name, lat, lng, rating, user_ratings_total, price_level, types):
+        self.place_id = place_id
+        self.name = name
+        self.lat = lat
+        self.lng = lng
+        self.rating = rating
+        self.user_ratings_total = user_ratings_total
+        self.price_level = price_level
+        self.types = types
+
+
+class PlaceTable:
+    """Places held column-wise: typed arrays for numbers, one shared tuple per distinct type list.
+
+    Only the fields used for querying are kept; addresses and photo references stay in SQLite.
+    Missing numbers are stored as NaN (floats) or -1 (integers) and read back as None.
+    """
+
+    def __init__(self):
+        self.rows = {}  # place_id -> row index
+        self.place_ids = []
+        self.names = []
+        self.lats = array('d')
+        self.lngs = array('d')
+        self.ratings = array('d')
+        self.review_totals = array('l')
+        self.price_levels = array('b')
+        self.types = []
+        self.type_tuples = {}  # Interned type tuples; a few dozen distinct ones cover every place
+
+    def __len__(self):
+        return len(self.place_ids)
+
+    def _shared_types(self, types):
+        key = tuple(types)
+        shared = self.type_tuples.get(key)
+        if shared is None:
+            shared = self.type_tuples[key] = tuple(sys.intern(t) for t in key)
+        return shared
+
+    def upsert(self, place_id, name, lat, lng, rating, user_ratings_total, price_level, types):
+        """Write one place into its row, appending a row for a new place_id"""
+        values = (
+            MISSING if lat is None else lat,
+            MISSING if lng is None else lng,
+            MISSING if rating is None else rating,
+            -1 if user_ratings_total is None else user_ratings_total,
+            -1 if price_level is None else price_level
+        )
+        types = self._shared_types(types)
+
+        row = self.rows.get(place_id)
+        if row is None:
+            self.rows[place_id] = len(self.place_ids)
+            self.place_ids.append(place_id)
+            self.names.append(name)
+            self.types.append(types)
+            for column, value in zip(self._numeric_columns(), values):
+                column.append(value)
+        else:
+            self.names[row] = name
+            self.types[row] = types
+            for column, value in zip(self._numeric_columns(), values):
+                column[row] = value
+
+    def _numeric_columns(self):
+        return self.lats, self.lngs, self.ratings, self.review_totals, self.price_levels
+
+    def record(self, row):
+        # NaN never equals itself, which marks a missing float
+        lat, lng, rating = self.lats[row], self.lngs[row], self.ratings[row]
+        reviews = self.review_totals[row]
+        price_level = self.price_levels[row]
+        return PlaceRecord(
+            self.place_ids[row], self.names[row],
+            None if lat != lat else lat,
+            None if lng != lng else lng,
+            None if rating != rating else rating,
+            None if reviews < 0 else reviews,
+            None if price_level < 0 else price_level,
+            self.types[row]
+        )
+
+    def get(self, place_id):
+        row = self.rows.get(place_id)
+        return None if row is None else self.record(row)
+
+    def located_records(self):
+        """Records for every row with coordinates"""
+        lats, lngs = self.lats, self.lngs
+        return [self.record(row) for row in range(len(self.place_ids))
+                if lats[row] == lats[row] and lngs[row] == lngs[row]]
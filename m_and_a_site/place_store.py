@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from place_records import PlaceTable, place_row
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'places.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS places (
+    place_id TEXT PRIMARY KEY,
+    name TEXT,
+    address TEXT,
+    lat REAL,
+    lng REAL,
+    rating REAL,
+    user_ratings_total INTEGER,
+    price_level INTEGER,
+    photo_reference TEXT,
+    types TEXT,
+    updated_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS place_details (
+    place_id TEXT PRIMARY KEY,
+    details_json TEXT,
+    reviews_json TEXT,
+    reviews_hash TEXT,
+    fetched_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS review_signals (
+    place_id TEXT PRIMARY KEY,
+    reviews_hash TEXT,
+    review_count INTEGER,
+    signal_new_owner INTEGER,
+    signal_closing INTEGER,
+    signal_second_location INTEGER,
+    signal_franchise INTEGER,
+    sentiment REAL,
+    latest_review_time INTEGER,
+    processed_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS enrichment (
+    place_id TEXT PRIMARY KEY,
+    website TEXT,
+    keywords_found TEXT,
+    keyword_count INTEGER,
+    updated_at REAL
+);
+"""
+
+# Columns from review_signals that are merged into API results for scoring
+SIGNAL_COLUMNS = [
+    'signal_new_owner', 'signal_closing', 'signal_second_location',
+    'signal_franchise', 'sentiment', 'latest_review_time'
+]
+
+
+def hash_reviews(reviews):
+    """Stable fingerprint of review content, used to skip unchanged places"""
+    payload = json.dumps(reviews, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class PlaceStore:
+    """SQLite-backed store of every place the proxy has seen, mirrored in memory as a column-wise PlaceTable"""
+
+    def __init__(self, db_path, load_places=True):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.listeners = []  # Called under the lock with each batch of written places for incremental aggregates
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.execute('ALTER TABLE places ADD COLUMN types TEXT')  # Databases created before types were kept
+        except sqlite3.OperationalError:
+            pass
+        self.conn.commit()
+
+        # Batch jobs that only page through details skip loading every place into memory
+        self.places = PlaceTable()
+        if load_places:
+            self._load_places()
+
+    def _load_places(self):
+        rows = self.conn.execute("""
+            SELECT place_id, name, lat, lng, rating, user_ratings_total, price_level, types
+            FROM places
+        """).fetchall()
+
+        for row in rows:
+            self.places.upsert(
+                row['place_id'], row['name'], row['lat'], row['lng'], row['rating'],
+                row['user_ratings_total'], row['price_level'], json.loads(row['types'] or '[]')
+            )
+
+        print(f"🗄️ Place store: {len(self.places)} places loaded from {self.db_path}")
+
+    def upsert_places(self, places):
+        """Insert or refresh places from Places API search or details results"""
+        now = time.time()
+        rows = [place_row(place) for place in places if place.get('place_id')]
+
+        with self.lock:
+            self.conn.executemany("""
+                INSERT INTO places (place_id, name, address, lat, lng, rating,
+                                    user_ratings_total, price_level, photo_reference, types, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(place_id) DO UPDATE SET
+                    name = excluded.name,
+                    address = excluded.address,
+                    lat = excluded.lat,
+                    lng = excluded.lng,
+                    rating = excluded.rating,
+                    user_ratings_total = excluded.user_ratings_total,
+                    price_level = excluded.price_level,
+                    photo_reference = excluded.photo_reference,
+                    types = excluded.types,
+                    updated_at = excluded.updated_at
+            """, [row[:9] + (json.dumps(row[9]), now) for row in rows])
+            self.conn.commit()
+
+            for place_id, name, _, lat, lng, rating, reviews, price_level, _, types in rows:
+                self.places.upsert(place_id, name, lat, lng, rating, reviews, price_level, types)
+
+            # Run inside the lock so listeners see writes in the same order as the table
+            if self.listeners:
+                written = [self.places.get(row[0]) for row in rows]
+                for listener in self.listeners:
+                    listener(written)
+
+        return len(rows)
+
+    def get_all_places(self):
+        """Return a PlaceRecord for every stored place that has coordinates, without touching the database"""
+        with self.lock:
+            return self.places.located_records()
+
+    def save_details(self, place_id, details, reviews):
+        """Store a details lookup along with its full-length review text"""
+        with self.lock:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO place_details
+                    (place_id, details_json, reviews_json, reviews_hash, fetched_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (
+                place_id,
+                json.dumps(details, ensure_ascii=False),
+                json.dumps(reviews, ensure_ascii=False),
+                hash_reviews(reviews),
+                time.time()
+            ))
+            self.conn.commit()
+
+    def get_review_signals(self, place_ids):
+        """Return {place_id: {column: value}} for places with extracted signals"""
+        if not place_ids:
+            return {}
+
+        placeholders = ','.join('?' * len(place_ids))
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT place_id, {', '.join(SIGNAL_COLUMNS)} FROM review_signals "
+                f"WHERE place_id IN ({placeholders})",
+                list(place_ids)
+            ).fetchall()
+
+        return {row['place_id']: {col: row[col] for col in SIGNAL_COLUMNS} for row in rows}
+
+    def get_pending_reviews(self, after_place_id='', limit=1000):
+        """Page through details whose reviews changed since signals were last extracted"""
+        with self.lock:
+            rows = self.conn.execute("""
+                SELECT d.place_id, d.reviews_json, d.reviews_hash
+                FROM place_details d
+                LEFT JOIN review_signals s ON s.place_id = d.place_id
+                WHERE d.place_id > ?
+                  AND (s.reviews_hash IS NULL OR s.reviews_hash != d.reviews_hash)
+                ORDER BY d.place_id
+                LIMIT ?
+            """, (after_place_id, limit)).fetchall()
+
+        return [tuple(row) for row in rows]
+
+    def save_review_signals(self, rows):
+        """Write extracted signal rows, one tuple per place in review_signals column order"""
+        with self.lock:
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO review_signals
+                    (place_id, reviews_hash, review_count, signal_new_owner, signal_closing,
+                     signal_second_location, signal_franchise, sentiment,
+                     latest_review_time, processed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            self.conn.commit()
+
+    def save_enrichment(self, place_id, website, keywords_found, keyword_count=0):
+        """Record the website and keyword scan outcome from the enrichment pipeline"""
+        with self.lock:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO enrichment (place_id, website, keywords_found, keyword_count, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (place_id, website, keywords_found, keyword_count, time.time()))
+            self.conn.commit()
+
+    def get_enrichment(self, place_ids):
+        """Return {place_id: {'website': ..., 'keywords_found': ...}} for enriched places"""
+        if not place_ids:
+            return {}
+
+        placeholders = ','.join('?' * len(place_ids))
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT place_id, website, keywords_found FROM enrichment WHERE place_id IN ({placeholders})",
+                list(place_ids)
+            ).fetchall()
+
+        return {row['place_id']: {'website': row['website'], 'keywords_found': row['keywords_found']}
+                for row in rows}
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Batch extraction of acquisition signals from stored review text.
+Run after details have been collected: python3 review_signals.py
+Only places whose reviews changed since the last run are reprocessed.
+"""
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from place_store import PlaceStore, DEFAULT_DB_PATH
+
+# Fixed-width guards placed before a phrase so negated mentions are skipped
+NEGATION = r"(?<!not )(?<!n't )(?<!n’t )(?<!not a )(?<!n't a )(?<!n’t a )(?<!\bno )"
+
+# Compiled once per worker process at import time
+SIGNAL_PATTERNS = {
+    'new_owner': re.compile(
+        r"\b(?:new|under new) (?:owners?|ownership|management)\b|\bchanged hands\b|\bbought the (?:place|restaurant)\b",
+        re.IGNORECASE),
+    'closing': re.compile(
+        r"\bclosing (?:its|their|our|the) doors\b|\b(?:closing|closed) (?:down|for good|permanently)\b"
+        r"|\bshutting (?:down|its doors)\b|\bout of business\b|\blast day (?:of business|open)\b",
+        re.IGNORECASE),
+    'second_location': re.compile(
+        r"\b(?:second|2nd|third|3rd|another|other) location\b"
+        r"|\bopening (?:a|another) (?:second |new )?(?:location|restaurant|spot)\b"
+        r"|\bexpanding (?:to|into) (?:a |another )?(?:new |second )?(?:locations?|spots?|markets?)\b",
+        re.IGNORECASE),
+    # "Not a franchise, family owned" is common in reviews of independents and must not count
+    'franchise': re.compile(
+        NEGATION + r"\b(?:franchise (?:owners?|locations?|opportunit(?:y|ies))|franchisees?"
+        r"|now franchising|(?:a|is) franchised?)\b",
+        re.IGNORECASE)
+}
+
+POSITIVE_PATTERN = re.compile(
+    r"\b(?:great|excellent|amazing|delicious|love|loved|best|fantastic|friendly|fresh|perfect|awesome|recommend)\b",
+    re.IGNORECASE)
+NEGATIVE_PATTERN = re.compile(
+    r"\b(?:bad|terrible|awful|worst|rude|cold|slow|dirty|bland|overpriced|disappointing|disappointed|never again)\b",
+    re.IGNORECASE)
+
+
+def extract_signals(item):
+    """Turn one (place_id, reviews_json, reviews_hash) row into a review_signals row"""
+    place_id, reviews_json, reviews_hash = item
+    reviews = json.loads(reviews_json or '[]')
+
+    counts = dict.fromkeys(SIGNAL_PATTERNS, 0)
+    positive = negative = 0
+    ratings = []
+    latest_time = None
+
+    for review in reviews:
+        text = review.get('text') or ''
+        for signal, pattern in SIGNAL_PATTERNS.items():
+            counts[signal] += len(pattern.findall(text))
+        positive += len(POSITIVE_PATTERN.findall(text))
+        negative += len(NEGATIVE_PATTERN.findall(text))
+
+        if review.get('rating') is not None:
+            ratings.append(review['rating'])
+        if review.get('time') and (latest_time is None or review['time'] > latest_time):
+            latest_time = review['time']
+
+    # Sentiment in [-1, 1]: word polarity blended with star ratings when present
+    lexicon = (positive - negative) / (positive + negative) if positive + negative else 0.0
+    if ratings:
+        stars = (sum(ratings) / len(ratings) - 3) / 2
+        sentiment = (lexicon + stars) / 2
+    else:
+        sentiment = lexicon
+
+    return (
+        place_id, reviews_hash, len(reviews),
+        counts['new_owner'], counts['closing'], counts['second_location'], counts['franchise'],
+        round(sentiment, 3), latest_time, time.time()
+    )
+
+
+def run(db_path=DEFAULT_DB_PATH, workers=None, batch_size=2000):
+    """Extract signals for every place with new or changed reviews"""
+    store = PlaceStore(db_path, load_places=False)
+    processed = 0
+    started = time.time()
+    last_place_id = ''
+
+    print(f"🧮 Review signals: starting with {workers or os.cpu_count()} workers")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            batch = store.get_pending_reviews(last_place_id, batch_size)
+            if not batch:
+                break
+
+            rows = list(pool.map(extract_signals, batch, chunksize=max(1, len(batch) // 64)))
+            store.save_review_signals(rows)
+
+            last_place_id = batch[-1][0]
+            processed += len(rows)
+            rate = processed / max(time.time() - started, 0.001)
+            print(f"📈 Review signals: {processed} places processed ({rate:.0f}/s)")
+
+    print(f"✅ Review signals complete: {processed} places in {time.time() - started:.1f}s")
+    return processed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Extract acquisition signals from stored reviews')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='Path to the place store database')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=2000, help='Places read per database page')
+    args = parser.parse_args()
+
+    run(args.db, args.workers, args.batch_size)
@@ -0,0 +1,228 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Every Google endpoint the proxy calls
+GOOGLE_ENDPOINTS = {
+    'textsearch': 'https://maps.googleapis.com/maps/api/place/textsearch/json',
+    'details': 'https://maps.googleapis.com/maps/api/place/details/json',
+    'photo': 'https://maps.googleapis.com/maps/api/place/photo',
+    'geocode': 'https://maps.googleapis.com/maps/api/geocode/json'
+}
+
+# (connect, read) timeouts in seconds per endpoint
+TIMEOUTS = {
+    'textsearch': (3.05, 10),
+    'details': (3.05, 8),
+    'photo': (3.05, 15),
+    'geocode': (3.05, 5)
+}
+
+# HTTP statuses and Google API statuses worth retrying
+RETRY_HTTP_STATUSES = {429, 500, 502, 503, 504}
+RETRY_API_STATUSES = {'OVER_QUERY_LIMIT', 'UNKNOWN_ERROR'}
+
+# Only bodies up to this size are decoded to look for an error status
+STATUS_BODY_MAX_BYTES = 1024
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling an endpoint whose circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Fail fast after repeated upstream failures, letting a single probe through after a cool-down"""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.time() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow_request(self):
+        """True while closed; once half-open, True for exactly one caller until its outcome is recorded"""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.time() - self.opened_at < self.reset_timeout or self.probing:
+                return False
+            self.probing = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                self.opened_at = time.time()
+            self.probing = False
+
+    def release_probe(self):
+        """Free the probe slot when a probe ended without a success or failure to record"""
+        with self.lock:
+            self.probing = False
+
+
+class UpstreamClient:
+    """Pooled, retrying HTTP client shared by every Google API call"""
+
+    def __init__(self, pool_maxsize=20, max_retries=3, backoff_base=0.5, backoff_cap=8):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+        # Keep-alive connections are reused across calls instead of a TLS handshake per request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(GOOGLE_ENDPOINTS), pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.breakers = {endpoint: CircuitBreaker() for endpoint in GOOGLE_ENDPOINTS}
+        # Attempt-level counters show retry churn; call-level ones are what callers actually wait
+        self.stats = {endpoint: {'attempts': 0, 'retries': 0, 'attempt_ms': 0.0,
+                                 'calls': 0, 'failures': 0, 'throttled': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+                      for endpoint in GOOGLE_ENDPOINTS}
+        self.stats_lock = threading.Lock()
+
+    def _api_status(self, response):
+        # Error statuses arrive in tiny bodies; larger payloads are results, left for the caller to decode once
+        if 'json' in response.headers.get('Content-Type', '') and len(response.content) <= STATUS_BODY_MAX_BYTES:
+            try:
+                return response.json().get('status')
+            except ValueError:
+                return None
+        return None
+
+    def _is_transient(self, response):
+        return response.status_code in RETRY_HTTP_STATUSES or self._api_status(response) in RETRY_API_STATUSES
+
+    def _is_throttled(self, response):
+        # Quota throttling means "slow down", not "Google is down"
+        return response.status_code == 429 or self._api_status(response) == 'OVER_QUERY_LIMIT'
+
+    def _record_attempt(self, endpoint, elapsed_ms, retried=False):
+        with self.stats_lock:
+            stats = self.stats[endpoint]
+            stats['attempts'] += 1
+            stats['attempt_ms'] += elapsed_ms
+            if retried:
+                stats['retries'] += 1
+
+    def _record_call(self, endpoint, elapsed_ms, failed=False, throttled=False):
+        with self.stats_lock:
+            stats = self.stats[endpoint]
+            stats['calls'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+            if failed:
+                stats['failures'] += 1
+            if throttled:
+                stats['throttled'] += 1
+
+    def _backoff(self, attempt):
+        # Full jitter keeps parallel workers from retrying in lockstep
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def get(self, endpoint, params):
+        """GET a Google endpoint by name, retrying transient errors with jittered backoff"""
+        url = GOOGLE_ENDPOINTS[endpoint]
+        breaker = self.breakers[endpoint]
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"Circuit open for {endpoint} - failing fast during upstream outage")
+
+        # A half-open probe gets one attempt, so recovery is decided in a single round trip
+        probe = breaker.state == 'half_open'
+        attempts = 1 if probe else self.max_retries + 1
+
+        try:
+            return self._call(endpoint, url, params, breaker, attempts)
+        finally:
+            if probe:
+                breaker.release_probe()
+
+    def _call(self, endpoint, url, params, breaker, attempts):
+        call_started = time.time()
+        response = None
+        error = None
+        transient = False
+
+        for attempt in range(attempts):
+            started = time.time()
+            try:
+                response = self.session.get(url, params=params, timeout=TIMEOUTS[endpoint])
+                transient = self._is_transient(response)
+                error = None
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                response = None
+                transient = True
+                error = e
+            elapsed_ms = (time.time() - started) * 1000
+            self._record_attempt(endpoint, elapsed_ms, retried=attempt > 0)
+
+            if not transient:
+                break
+
+            reason = error or (f"HTTP {response.status_code}" if response.status_code != 200
+                               else self._api_status(response))
+            print(f"⚠️ Upstream {endpoint} attempt {attempt + 1} failed after {elapsed_ms:.0f}ms: {reason}")
+
+            if attempt < attempts - 1:
+                time.sleep(self._backoff(attempt))
+                # Other calls may have opened the breaker meanwhile; stop retrying into the outage
+                if breaker.state != 'closed':
+                    self._record_call(endpoint, (time.time() - call_started) * 1000, failed=True)
+                    raise CircuitOpenError(f"Circuit opened for {endpoint} while retrying")
+
+        # The breaker sees one outcome per call, once retries are exhausted
+        throttled = transient and response is not None and self._is_throttled(response)
+        if not transient:
+            breaker.record_success()
+        elif not throttled:
+            breaker.record_failure()
+        self._record_call(endpoint, (time.time() - call_started) * 1000, failed=transient, throttled=throttled)
+
+        if error is not None:
+            raise error
+
+        # Out of retries on an error response: hand it back so the caller reports the status
+        return response
+
+    def get_stats(self):
+        """Per-endpoint call latency (including retries and backoff) alongside per-attempt counters"""
+        with self.stats_lock:
+            return {
+                endpoint: {
+                    'calls': stats['calls'],
+                    'failures': stats['failures'],
+                    'throttled': stats['throttled'],
+                    'avg_ms': round(stats['total_ms'] / stats['calls'], 1) if stats['calls'] else 0,
+                    'max_ms': round(stats['max_ms'], 1),
+                    'attempts': stats['attempts'],
+                    'retries': stats['retries'],
+                    'avg_attempt_ms': round(stats['attempt_ms'] / stats['attempts'], 1) if stats['attempts'] else 0,
+                    'circuit': self.breakers[endpoint].state
+                }
+                for endpoint, stats in self.stats.items()
+            }
+
+
+# Shared by the whole proxy process
+upstream = UpstreamClient()
@@ -1,5 +1,10 @@
+import asyncio
+import re
+from urllib.parse import urljoin, urldefrag, urlparse
+
 try:
     from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright
     PLAYWRIGHT_AVAILABLE = True
     print("✅ Playwright ready for webscraper!")
     print(sync_playwright)
@@ -7,6 +12,35 @@ except ImportError:
     PLAYWRIGHT_AVAILABLE = False
     print("❌ Playwright not available")
 
+# Path fragments that usually lead to pages carrying the signals we scan for
+PRIORITY_PATH_HINTS = ['franchis', 'location', 'career', 'job', 'reserv', 'about', 'opening', 'news']
+
+# Upper bounds on a single crawl, whatever the caller asks for
+CRAWL_MAX_DEPTH = 3
+CRAWL_MAX_PAGES = 25
+
+# Query parameters that only track the visit and never select different content
+TRACKING_PARAMS = re.compile(r'^(?:utm_\w+|fbclid|gclid|mc_cid|mc_eid)$', re.IGNORECASE)
+
+# Links to these are never pages worth rendering
+SKIP_EXTENSIONS = re.compile(r'\.(?:pdf|jpe?g|png|gif|svg|webp|zip|mp4|mp3|docx?|xlsx?)$', re.IGNORECASE)
+
+
+def normalize_url(url):
+    """Key used to deduplicate crawl URLs: no fragment, tracking parameters or trailing slash"""
+    url, _ = urldefrag(url)
+    parsed = urlparse(url)
+    path = parsed.path.rstrip('/') or '/'
+    # ?page_id=42-style sites select the page by query, so the remaining parameters stay in the key
+    query = '&'.join(sorted(param for param in parsed.query.split('&')
+                            if param and not TRACKING_PARAMS.match(param.split('=')[0])))
+    return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}{path}" + (f"?{query}" if query else '')
+
+
+def site_domain(url):
+    return urlparse(url).netloc.lower().removeprefix('www.')
+
+
 class WebScraper:
     def __init__(self):
         self.keywords = [
@@ -42,6 +76,105 @@ class WebScraper:
                 'error': str(e)
             }
 
+    def path_priority(self, url):
+        """Score a URL by how many keyword or hint fragments its path contains"""
+        path = urlparse(url).path.lower().replace('-', ' ').replace('_', ' ')
+        return (sum(1 for kw in self.keywords if kw in path)
+                + sum(1 for hint in PRIORITY_PATH_HINTS if hint in path))
+
+    def crawl_website(self, url, max_depth=2, max_pages=10, concurrency=4):
+        """Breadth-first same-domain crawl aggregating keyword hits across pages"""
+        if not PLAYWRIGHT_AVAILABLE:
+            return {'success': False, 'error': 'Playwright not available'}
+
+        max_depth = min(max(max_depth, 0), CRAWL_MAX_DEPTH)
+        max_pages = min(max(max_pages, 1), CRAWL_MAX_PAGES)
+        try:
+            return asyncio.run(self._crawl(url, max_depth, max_pages, concurrency))
+        except Exception as e:
+            return {
+                'success': False,
+                'url': url,
+                'error': str(e)
+            }
+
+    async def _crawl(self, url, max_depth, max_pages, concurrency):
+        domain = None
+        seen = {normalize_url(url)}
+        frontier = [url]
+        pages = []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            # One context per site so cookies and cache are shared across its pages
+            context = await browser.new_context()
+
+            async def fetch(page_url):
+                async with semaphore:
+                    page = await context.new_page()
+                    try:
+                        await page.goto(page_url, timeout=10000, wait_until='domcontentloaded')
+                        text = (await page.inner_text('body')).lower()
+                        links = await page.eval_on_selector_all('a[href]', 'els => els.map(e => e.href)')
+                        # page.url is where any redirects ended up
+                        return page.url, text, links, None
+                    except Exception as e:
+                        return page_url, '', [], str(e)
+                    finally:
+                        await page.close()
+
+            for depth in range(max_depth + 1):
+                budget = max_pages - len(pages)
+                if not frontier or budget <= 0:
+                    break
+
+                # Most promising paths first when the budget can't cover the whole level
+                frontier.sort(key=self.path_priority, reverse=True)
+                results = await asyncio.gather(*(fetch(u) for u in frontier[:budget]))
+
+                next_frontier = []
+                for page_url, text, links, error in results:
+                    if domain is None:
+                        # Taken from the landed page so a bare domain redirecting to www.* keeps its links
+                        domain = site_domain(page_url)
+                    seen.add(normalize_url(page_url))
+                    pages.append({
+                        'url': page_url,
+                        'found_keywords': [kw for kw in self.keywords if kw in text],
+                        'error': error
+                    })
+
+                    for link in links:
+                        link = urljoin(page_url, link)
+                        if not link.startswith(('http://', 'https://')) or site_domain(link) != domain:
+                            continue
+                        if SKIP_EXTENSIONS.search(urlparse(link).path):
+                            continue
+                        normalized = normalize_url(link)
+                        if normalized not in seen:
+                            seen.add(normalized)
+                            next_frontier.append(urldefrag(link)[0])
+
+                frontier = next_frontier
+
+            await browser.close()
+
+        if all(page['error'] for page in pages):
+            return {'success': False, 'url': url, 'error': pages[0]['error'] if pages else 'No pages fetched'}
+
+        found_keywords = [kw for kw in self.keywords
+                          if any(kw in page['found_keywords'] for page in pages)]
+
+        return {
+            'success': True,
+            'url': url,
+            'found_keywords': found_keywords,
+            'keyword_count': len(found_keywords),
+            'pages_scanned': len(pages),
+            'pages': pages
+        }
+
 if __name__ == "__main__":
     scraper = WebScraper()
 